@@ -0,0 +1,175 @@
+import json
+from typing import Annotated, Optional
+
+import numpy as np
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ..core import money, profit
+from ..core.cache import ResultCache
+from ..core.plan_history import get_plan_writer, record_plan
+from .schemas import GridRange, ProfitBatchInput, ProfitCalculationInput, ProfitCalculationOutput, ProfitGridInput
+
+router = APIRouter()
+
+NDJSON = "application/x-ndjson"
+GRID_BINARY = "application/octet-stream"
+STREAM_CHUNK_ROWS = 8192
+MAX_GRID_CELLS = 4_000_000
+CACHE_MAX_AGE = 3600
+
+result_cache = ResultCache(maxsize=1024, ttl=300.0)
+
+
+async def startup(app):
+    get_plan_writer(app).start()
+
+
+async def shutdown(app):
+    await get_plan_writer(app).stop()
+
+
+def _plan_units(payload):
+    return (
+        payload.cups_planned,
+        money.to_units(payload.price_per_cup),
+        money.to_units(payload.cost_per_cup),
+        money.to_units(payload.fixed_costs),
+    )
+
+
+def render_profit(result):
+    """Same bytes as ProfitCalculationOutput(**result).model_dump_json(), without pydantic in the loop."""
+    fmt = money.format_cents
+    break_even = result["break_even_cups"]
+    return (
+        f'{{"revenue":"{fmt(result["revenue"])}","variable_costs":"{fmt(result["variable_costs"])}",'
+        f'"total_costs":"{fmt(result["total_costs"])}","profit":"{fmt(result["profit"])}",'
+        f'"break_even_cups":{"null" if break_even is None else break_even}}}'
+    ).encode()
+
+
+def _cached_profit(plan):
+    # Keyed on whole units, so 1.5, "1.50" and "1.50000" share one entry.
+    entry = result_cache.get(plan)
+    if entry is None:
+        entry = result_cache.put(plan, render_profit(profit.calc_profit(*plan)))
+    return entry
+
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@router.post("/calc-profit", response_model=ProfitCalculationOutput)
+def calc_profit(payload: ProfitCalculationInput, request: Request):
+    plan = _plan_units(payload)
+    entry = _cached_profit(plan)
+    record_plan(get_plan_writer(request.app), *plan)
+    return Response(entry.body, media_type="application/json", headers={"ETag": entry.etag})
+
+
+@router.get("/calc-profit", response_model=ProfitCalculationOutput)
+def calc_profit_get(
+    payload: Annotated[ProfitCalculationInput, Query()],
+    if_none_match: Optional[str] = Header(None),
+):
+    # Not recorded in plan history: GET is idempotent and may be served from any cache.
+    entry = _cached_profit(_plan_units(payload))
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={CACHE_MAX_AGE}"}
+    if _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/calc-profit/cache")
+def calc_profit_cache_stats():
+    return result_cache.stats()
+
+
+def _batch_columns(result):
+    """Rows as the single endpoint renders them: cents as two-decimal strings, null for invalid rows."""
+    valid = result["valid"].tolist()
+    columns = {"valid": valid}
+    for name in profit.MONEY_COLUMNS:
+        columns[name] = [money.format_cents(c) if ok else None for c, ok in zip(result[name].tolist(), valid)]
+    columns["break_even_cups"] = [
+        b if ok and b >= 0 else None for b, ok in zip(result["break_even_cups"].tolist(), valid)
+    ]
+    return columns
+
+
+def _ndjson_rows(columns):
+    total = len(columns[0])
+    for start in range(0, total, STREAM_CHUNK_ROWS):
+        chunk = [c[start:start + STREAM_CHUNK_ROWS] for c in columns]
+        rendered = _batch_columns(profit.calc_profit_batch(*chunk))
+        names = ["valid", *profit.RESULT_COLUMNS]
+        lines = [
+            json.dumps({"row": start + offset, **dict(zip(names, values))})
+            for offset, values in enumerate(zip(*(rendered[name] for name in names)))
+        ]
+        yield "\n".join(lines) + "\n"
+
+
+@router.post("/calc-profit/batch")
+def calc_profit_batch(payload: ProfitBatchInput, request: Request):
+    try:
+        columns = profit.as_columns(*(getattr(payload, name) for name in profit.BATCH_COLUMNS))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    if NDJSON in request.headers.get("accept", ""):
+        return StreamingResponse(_ndjson_rows(columns), media_type=NDJSON)
+
+    result = profit.calc_profit_batch(*columns)
+    return JSONResponse({"invalid_rows": int((~result["valid"]).sum()), **_batch_columns(result)})
+
+
+def _axis(value):
+    if isinstance(value, GridRange):
+        return np.linspace(value.start, value.stop, value.steps)
+    return np.array([value], dtype=np.float64)
+
+
+def _steps(value):
+    return value.steps if isinstance(value, GridRange) else 1
+
+
+def _demand(curve):
+    if curve is None:
+        return None
+    if curve.model == "linear":
+        return lambda prices: profit.linear_demand(prices, curve.intercept, curve.slope)
+    return lambda prices: profit.elasticity_demand(prices, curve.scale, curve.elasticity)
+
+
+@router.post("/calc-profit/grid")
+def calc_profit_grid(payload: ProfitGridInput, request: Request):
+    # Checked before any axis is built, so huge step counts never allocate.
+    if _steps(payload.price_per_cup) * _steps(payload.cups_planned) * _steps(payload.cost_per_cup) > MAX_GRID_CELLS:
+        raise HTTPException(status_code=422, detail=f"grid exceeds {MAX_GRID_CELLS} cells")
+    # Money axes are snapped to units once, so every cell is a plan the single endpoint could price.
+    prices = money.to_units_array(_axis(payload.price_per_cup))
+    cups = np.round(_axis(payload.cups_planned)).astype(np.int64)
+    costs = money.to_units_array(_axis(payload.cost_per_cup))
+    grid = profit.profit_grid(prices, cups, costs, money.to_units(payload.fixed_costs), _demand(payload.demand))
+
+    surface = grid["profit"]
+    if GRID_BINARY in request.headers.get("accept", ""):
+        # Little-endian int64 cents in C order over (cost, price, cups).
+        return Response(surface.astype("<i8").tobytes(), media_type=GRID_BINARY,
+                        headers={"X-Grid-Shape": ",".join(map(str, surface.shape))})
+    return JSONResponse({
+        "price_per_cup": (prices / money.UNITS_PER_DOLLAR).tolist(),
+        "cups_planned": cups.tolist(),
+        "cost_per_cup": (costs / money.UNITS_PER_DOLLAR).tolist(),
+        "shape": list(surface.shape),
+        # Flat, C order over (cost, price, cups); whole cents.
+        "profit_cents": surface.ravel().tolist(),
+        "break_even_cups": [[None if v < 0 else v for v in row] for row in grid["break_even_cups"].tolist()],
+        "optimal": grid.get("optimal"),
+    })
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.db import get_async_db, get_database
+from ..core.plan_history import get_plan_writer, list_plans
+from .schemas import PlanHistoryPage
+
+router = APIRouter()
+
+
+async def startup(app):
+    get_plan_writer(app).start()
+
+
+async def shutdown(app):
+    await get_plan_writer(app).stop()
+
+
+@router.get("/plans", response_model=PlanHistoryPage)
+async def get_plans(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    before_id: int = Query(None, ge=1),
+    session: AsyncSession = Depends(get_async_db),
+):
+    items = await list_plans(get_database(request.app), session, limit, before_id)
+    return {"items": items, "next_before_id": items[-1].id if len(items) == limit else None}
+
+
+@router.get("/plans/queue")
+def get_plan_queue_stats(request: Request):
+    return get_plan_writer(request.app).stats()
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from ..core import db
+
+router = APIRouter()
+
+
+@router.get("/health/ready")
+async def health_ready(request: Request):
+    check = await db.get_database(request.app).check_ready()
+    return JSONResponse({"status": "ok" if check["ok"] else "unavailable", **check}, status_code=200 if check["ok"] else 503)
@@ -0,0 +1,111 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Any, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, WithJsonSchema, confloat
+
+from ..core import money
+
+# Integer cents, written out as a two-decimal string like the Decimal fields were.
+CentsOutput = Annotated[
+    int,
+    PlainSerializer(money.format_cents, return_type=str),
+    WithJsonSchema({"type": "string", "format": "decimal"}),
+]
+
+
+class ProfitCalculationInput(BaseModel):
+    # Upper bounds keep every plan storable in the plan_history columns.
+    cups_planned: int = Field(..., ge=0, le=money.MAX_CUPS)
+    price_per_cup: Decimal = Field(..., ge=0, le=money.MAX_DOLLARS)
+    cost_per_cup: Decimal = Field(..., ge=0, le=money.MAX_DOLLARS)
+    fixed_costs: Decimal = Field(..., ge=0, le=money.MAX_DOLLARS)
+
+
+class ProfitCalculationOutput(BaseModel):
+    revenue: CentsOutput
+    variable_costs: CentsOutput
+    total_costs: CentsOutput
+    profit: CentsOutput
+    break_even_cups: Optional[int]
+
+
+# Cells are parsed in the calculation core rather than here, so a malformed cell
+# only invalidates its own row.
+BatchCell = Annotated[Any, WithJsonSchema({"anyOf": [{"type": "number"}, {"type": "null"}]})]
+
+
+class ProfitBatchInput(BaseModel):
+    # Per-row checks happen in the calculation core so one bad row is
+    # reported in the ``valid`` mask instead of rejecting the whole batch.
+    cups_planned: List[BatchCell]
+    price_per_cup: List[BatchCell]
+    cost_per_cup: List[BatchCell]
+    fixed_costs: List[BatchCell]
+
+
+class GridRange(BaseModel):
+    # Money axis; limits match what calc_profit_batch accepts.
+    start: float = Field(..., ge=0, le=money.MAX_DOLLARS)
+    stop: float = Field(..., ge=0, le=money.MAX_DOLLARS)
+    steps: int = Field(..., ge=1)
+
+
+class CupsRange(GridRange):
+    start: float = Field(..., ge=0, le=money.MAX_CUPS)
+    stop: float = Field(..., ge=0, le=money.MAX_CUPS)
+
+
+class LinearDemand(BaseModel):
+    model: Literal["linear"]
+    intercept: float = Field(..., ge=0)
+    slope: float = Field(..., ge=0)
+
+
+class ElasticityDemand(BaseModel):
+    model: Literal["elasticity"]
+    scale: float = Field(..., ge=0)
+    elasticity: float = Field(..., gt=0)
+
+
+class ProfitGridInput(BaseModel):
+    price_per_cup: GridRange
+    cups_planned: CupsRange
+    cost_per_cup: Union[GridRange, confloat(ge=0, le=money.MAX_DOLLARS)]
+    fixed_costs: float = Field(..., ge=0, le=money.MAX_DOLLARS)
+    demand: Optional[Union[LinearDemand, ElasticityDemand]] = None
+
+
+class SimulationInput(BaseModel):
+    cups_planned: int = Field(..., ge=0, le=money.MAX_CUPS)
+    price_per_cup: float = Field(..., gt=0, le=money.MAX_DOLLARS)
+    cost_per_cup: float = Field(..., ge=0, le=money.MAX_DOLLARS)
+    fixed_costs: float = Field(..., ge=0, le=money.MAX_DOLLARS)
+    days: int = Field(30, ge=1, le=366)
+    # Expected cups per day at reference_price on an average day.
+    base_demand: float = Field(..., ge=0, le=1e9)
+    reference_price: float = Field(1.0, gt=0, le=money.MAX_DOLLARS)
+    elasticity: float = Field(1.0, ge=0, le=20)
+    sunny_probability: float = Field(0.6, ge=0, le=1)
+    sunny_multiplier: float = Field(1.3, ge=0, le=100)
+    rainy_multiplier: float = Field(0.5, ge=0, le=100)
+    traffic_sigma: float = Field(0.25, ge=0, le=3)
+    paths: int = Field(10_000, ge=1, le=10_000_000)
+    seed: Optional[int] = Field(None, ge=0)
+
+
+class PlanHistoryItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_at: datetime
+    cups_planned: int
+    price_per_cup: Decimal
+    cost_per_cup: Decimal
+    fixed_costs: Decimal
+
+
+class PlanHistoryPage(BaseModel):
+    items: List[PlanHistoryItem]
+    # Pass back as ``before_id`` to fetch the next (older) page; null on the last page.
+    next_before_id: Optional[int]
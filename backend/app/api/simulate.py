@@ -0,0 +1,41 @@
+import json
+import secrets
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from ..core import simulation
+from .schemas import SimulationInput
+
+router = APIRouter()
+
+EVENT_STREAM = "text/event-stream"
+
+
+async def shutdown(app):
+    simulation.shutdown_pool()
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/simulate")
+async def simulate(payload: SimulationInput, request: Request):
+    params = {name: getattr(payload, name) for name in simulation.PARAMS}
+    seed = payload.seed if payload.seed is not None else secrets.randbits(63)
+    runs = simulation.simulate(params, payload.paths, seed)
+
+    if EVENT_STREAM in request.headers.get("accept", ""):
+        async def events():
+            summary = {}
+            async for aggregate in runs:
+                summary = {"seed": seed, "total_paths": payload.paths, **aggregate.summary()}
+                yield _sse("progress", summary)
+            yield _sse("result", summary)
+
+        return StreamingResponse(events(), media_type=EVENT_STREAM)
+
+    async for aggregate in runs:
+        pass
+    return {"seed": seed, "total_paths": payload.paths, **aggregate.summary()}
@@ -0,0 +1,65 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CachedResult = namedtuple("CachedResult", ["body", "etag", "expires"])
+
+
+class ResultCache:
+    """Bounded LRU cache of serialized responses with a per-entry TTL.
+
+    Entries hold response bytes plus a strong ETag derived from them, so a hit
+    needs neither the calculation nor serialization.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body):
+        entry = CachedResult(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', self._clock() + self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -1,16 +1,63 @@
-from pydantic import BaseSettings
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     DB_DRIVER: str = "mysql"
+    DB_ASYNC_DRIVER: str = "mysql+aiomysql"
     DB_HOST: str = "localhost"
     DB_PORT: int = 3306
     DB_NAME: str = "sanjaya"
     DB_USER: str = "sanjaya"
     DB_PASSWORD: str = "password"
+    # Full async URL, e.g. sqlite+aiosqlite:///./lemonade.db; overrides the DB_* parts.
+    DATABASE_URL: Optional[str] = None
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_READY_CACHE_SECONDS: float = 5.0
+
+    PLAN_HISTORY_MAX_QUEUE: int = 10_000
+    PLAN_HISTORY_FLUSH_SIZE: int = 500
+    PLAN_HISTORY_FLUSH_SECONDS: float = 1.0
+
+    model_config = SettingsConfigDict(env_file=".env")
+
+    def _url(self, driver):
+        return f"{driver}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    @property
+    def database_url(self):
+        if self.DATABASE_URL:
+            # Imported here so reading settings does not pull in SQLAlchemy at startup.
+            from sqlalchemy.engine import make_url
+
+            # Same database through the dialect's default (blocking) driver.
+            url = make_url(self.DATABASE_URL)
+            return url.set(drivername=url.get_backend_name()).render_as_string(hide_password=False)
+        return self._url(self.DB_DRIVER)
+
+    @property
+    def async_database_url(self):
+        return self.DATABASE_URL or self._url(self.DB_ASYNC_DRIVER)
+
+
+_settings = None
+
 
-    class Config:
-        env_file = ".env"
+def get_settings():
+    """Default settings; the environment and .env are only read on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
 
 
-settings = Settings()
+def __getattr__(name):
+    # Keeps ``from .config import settings`` working without reading .env at import.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
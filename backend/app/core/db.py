@@ -1,19 +1,103 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from .config import settings
+from starlette.requests import Request
+
+from .config import get_settings
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+_default = None
+
+
+class Database:
+    """Engines for one set of settings, built on first use so creating an app never touches the database."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._engine = None
+        self._async_engine = None
+        self._ready = {"checked_at": None, "ok": False, "error": None}
+
+    def _pool_options(self, url):
+        # In-memory SQLite uses a single static connection and takes no pool sizing.
+        if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+            return {}
+        return {
+            "pool_size": self.settings.DB_POOL_SIZE,
+            "max_overflow": self.settings.DB_MAX_OVERFLOW,
+            "pool_recycle": self.settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.settings.DB_POOL_PRE_PING,
+        }
 
-DATABASE_URL = (
-    f"{settings.DB_DRIVER}://{settings.DB_USER}:{settings.DB_PASSWORD}"
-    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-)
+    def get_engine(self):
+        if self._engine is None:
+            url = self.settings.database_url
+            self._engine = create_engine(url, echo=False, future=True, **self._pool_options(url))
+        return self._engine
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def get_async_engine(self):
+        if self._async_engine is None:
+            url = self.settings.async_database_url
+            self._async_engine = create_async_engine(url, echo=False, **self._pool_options(url))
+        return self._async_engine
+
+    async def check_ready(self):
+        """Report whether the database answers, probing at most every DB_READY_CACHE_SECONDS.
+
+        The probe borrows a pooled connection, so repeated checks reuse the pool
+        instead of dialling the database each time.
+        """
+        now = time.monotonic()
+        checked_at = self._ready["checked_at"]
+        if checked_at is None or now - checked_at >= self.settings.DB_READY_CACHE_SECONDS:
+            try:
+                async with self.get_async_engine().connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                self._ready.update(ok=True, error=None)
+            except (SQLAlchemyError, OSError, ImportError) as exc:
+                # ImportError: the configured DB driver is not installed, so no engine can be built.
+                self._ready.update(ok=False, error=type(exc).__name__)
+            self._ready["checked_at"] = now
+        pool = self._async_engine.pool.status() if self._async_engine is not None else None
+        return {"ok": self._ready["ok"], "error": self._ready["error"], "pool": pool}
+
+    async def dispose(self):
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+        self._ready.update(checked_at=None, ok=False, error=None)
+
+
+def get_database(app=None):
+    """The app's database, built from ``app.state.settings``; without an app, the one for scripts."""
+    global _default
+    if app is None:
+        if _default is None:
+            _default = Database(get_settings())
+        return _default
+    database = getattr(app.state, "db", None)
+    if database is None:
+        database = app.state.db = Database(app.state.settings)
+    return database
 
 
 def get_db():
-    db = SessionLocal()
+    """Blocking session for scripts; request handlers use get_async_db."""
+    db = SessionLocal(bind=get_database().get_engine())
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal(bind=get_database(request.app).get_async_engine()) as db:
+        yield db
@@ -0,0 +1,129 @@
+import logging
+import random
+from bisect import bisect_left
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, matching the Prometheus client defaults.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+UNMATCHED = "unmatched"
+
+
+class RouteStats:
+    __slots__ = ("statuses", "buckets", "total_seconds")
+
+    def __init__(self):
+        self.statuses = [0] * len(STATUS_CLASSES)
+        # One slot per bucket plus +Inf; made cumulative only when rendered.
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_seconds = 0.0
+
+
+class MetricsRegistry:
+    """Per-process request counters.
+
+    Updates only happen on the event loop thread, so plain integer slots are
+    enough; each worker process exports its own series.
+    """
+
+    def __init__(self):
+        self.routes = {}
+
+    def observe(self, method, route, status, seconds):
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats()
+        stats.statuses[min(max(status // 100, 1), 5) - 1] += 1
+        stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.total_seconds += seconds
+
+    def render(self):
+        lines = [
+            "# HELP http_requests_total Requests handled, by route and status class.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            for status, count in zip(STATUS_CLASSES, stats.statuses):
+                if count:
+                    lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        lines += [
+            "# HELP http_request_duration_seconds Request latency, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.total_seconds}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def route_label(scope):
+    """Route template for a handled request, keeping label cardinality bounded."""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED
+    # Newer FastAPI keeps routes of an included router unprefixed and records
+    # the prefixed template of the matched route here instead.
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(effective, "path", None) or route.path
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording a count and latency per request.
+
+    When ``slow_request_seconds`` is set, a ``slow_request_sample_rate``
+    fraction of requests slower than that is logged with a timing breakdown:
+    reading the body, the handler (validation, endpoint and serialization,
+    which FastAPI runs as one step) and sending the response.
+    """
+
+    def __init__(self, app, registry, slow_request_seconds=None, slow_request_sample_rate=1.0):
+        self.app = app
+        self.registry = registry
+        self.slow_request_seconds = slow_request_seconds
+        self.slow_request_sample_rate = slow_request_sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        marks = {}
+
+        async def timed_receive():
+            message = await receive()
+            if not message.get("more_body"):
+                marks["body"] = perf_counter()
+            return message
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                marks["status"] = message["status"]
+                marks["response"] = perf_counter()
+            await send(message)
+
+        tracing = self.slow_request_seconds is not None
+        try:
+            await self.app(scope, timed_receive if tracing else receive, timed_send)
+        finally:
+            end = perf_counter()
+            route = route_label(scope)
+            self.registry.observe(scope["method"], route, marks.get("status", 500), end - start)
+            if tracing and end - start >= self.slow_request_seconds and random.random() < self.slow_request_sample_rate:
+                self._log_slow(scope["method"], route, start, end, marks)
+
+    @staticmethod
+    def _log_slow(method, route, start, end, marks):
+        body = marks.get("body", start)
+        response = marks.get("response", end)
+        logger.warning(
+            "slow request %s %s: total=%.1fms read_body=%.1fms handler=%.1fms send=%.1fms",
+            method, route, (end - start) * 1e3, (body - start) * 1e3, (response - body) * 1e3, (end - response) * 1e3,
+        )
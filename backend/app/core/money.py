@@ -0,0 +1,104 @@
+"""Fixed-point money.
+
+Amounts come in as whole units of a hundredth of a cent ($0.0001, the
+precision plan history stores), rounding half up at the fourth decimal. All
+arithmetic on them is exact integer math; each money result is then rounded
+half up to whole cents (0.125 -> 13 cents, -0.125 -> -13 cents) and
+formatted as a two-decimal string on the way out.
+"""
+import math
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+import numpy as np
+
+UNITS_PER_DOLLAR = 10_000
+UNITS_PER_CENT = 100
+PLACES = 4
+
+# Caps for vectorized int64 math: cups * units stays below 2**63.
+MAX_CUPS = 10**7
+MAX_DOLLARS = 10**7
+
+_PLAIN_DECIMAL = re.compile(r"(\d*)(?:\.(\d*))?")
+
+
+def _decimal_to_units(value):
+    return int((value * UNITS_PER_DOLLAR).to_integral_value(ROUND_HALF_UP))
+
+
+def _str_to_units(text):
+    match = _PLAIN_DECIMAL.fullmatch(text)
+    if match is None or text in ("", "."):
+        # Exponents and other spellings Decimal understands take the slow path.
+        try:
+            return _decimal_to_units(Decimal(text))
+        except InvalidOperation:
+            raise ValueError(f"not a number: {text!r}") from None
+    whole, frac = match.group(1), match.group(2) or ""
+    # Half up only depends on the first digit past the kept places.
+    return (
+        int(whole or "0") * UNITS_PER_DOLLAR + int(frac[:PLACES].ljust(PLACES, "0"))
+        + (frac[PLACES:PLACES + 1] >= "5")
+    )
+
+
+def to_units(value):
+    """Whole $0.0001 units for a non-negative int, float, str or Decimal amount of dollars."""
+    if isinstance(value, bool):
+        raise ValueError("not a number")
+    if isinstance(value, int):
+        units = value * UNITS_PER_DOLLAR
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("must be finite")
+        # repr() is the shortest string that round-trips, i.e. what the client wrote.
+        units = _str_to_units(repr(abs(value))) * (-1 if value < 0 else 1)
+    elif isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError("must be finite")
+        units = _decimal_to_units(value)
+    elif isinstance(value, str):
+        text = value.strip()
+        negative = text.startswith("-")
+        units = _str_to_units(text.lstrip("+-")) * (-1 if negative else 1)
+    else:
+        raise ValueError("not a number")
+    if units < 0:
+        raise ValueError("must be non-negative")
+    return units
+
+
+def units_to_cents(units):
+    """Whole cents, half away from zero like Decimal's ROUND_HALF_UP."""
+    if units < 0:
+        return -units_to_cents(-units)
+    return (units + UNITS_PER_CENT // 2) // UNITS_PER_CENT
+
+
+def units_to_cents_array(units):
+    return np.sign(units) * ((np.abs(units) + UNITS_PER_CENT // 2) // UNITS_PER_CENT)
+
+
+def format_cents(cents):
+    if cents < 0:
+        return "-" + format_cents(-cents)
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def units_to_decimal(units):
+    return Decimal(units).scaleb(-PLACES)
+
+
+def to_units_array(dollars):
+    """Vectorized to_units for float64 dollars; non-finite entries come back as 0.
+
+    Values within a millionth of a unit of a half count as the half, so decimal
+    inputs whose binary float sits just below it still round up.
+    """
+    finite = np.where(np.isfinite(dollars), dollars, 0.0)
+    return np.floor(np.round(finite * UNITS_PER_DOLLAR, 6) + 0.5).astype(np.int64)
+
+
+def ceil_div(numerator, denominator):
+    return -(-numerator // denominator)
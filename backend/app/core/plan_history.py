@@ -0,0 +1,72 @@
+import weakref
+from datetime import datetime, timezone
+from functools import partial
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError, DataError, IntegrityError, StatementError
+
+from ..models import Base, PlanHistory
+from . import db, money
+from .write_behind import WriteBehindQueue
+
+_schema_engines = weakref.WeakSet()
+
+
+async def ensure_schema(database):
+    """Create the history table once per engine; there are no migrations for this demo store."""
+    engine = database.get_async_engine()
+    if engine not in _schema_engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_engines.add(engine)
+
+
+async def insert_plans(database, rows):
+    await ensure_schema(database)
+    async with db.AsyncSessionLocal(bind=database.get_async_engine()) as session:
+        # One INSERT ... VALUES (...), (...) per flush; flush_size keeps it under bind-parameter limits.
+        await session.execute(insert(PlanHistory).values(rows))
+        await session.commit()
+
+
+def is_record_error(exc):
+    """Whether a failed INSERT was caused by its rows rather than by the database being unavailable."""
+    if isinstance(exc, (DataError, IntegrityError, OverflowError, ValueError, TypeError)):
+        return True
+    # StatementError alone wraps errors raised while binding parameters; other
+    # DBAPIErrors (OperationalError, ...) are connection or server failures.
+    return isinstance(exc, StatementError) and not isinstance(exc, DBAPIError)
+
+
+def get_plan_writer(app):
+    """The app's write-behind queue for plan history, sized from ``app.state.settings``."""
+    writer = getattr(app.state, "plan_writer", None)
+    if writer is None:
+        settings = app.state.settings
+        writer = app.state.plan_writer = WriteBehindQueue(
+            partial(insert_plans, db.get_database(app)),
+            max_items=settings.PLAN_HISTORY_MAX_QUEUE,
+            flush_size=settings.PLAN_HISTORY_FLUSH_SIZE,
+            flush_interval=settings.PLAN_HISTORY_FLUSH_SECONDS,
+            is_record_error=is_record_error,
+        )
+    return writer
+
+
+def record_plan(writer, cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    """Queue a plan for history; money arguments are integer units (see money.to_units)."""
+    return writer.offer({
+        "created_at": datetime.now(timezone.utc),
+        "cups_planned": cups_planned,
+        "price_per_cup": money.units_to_decimal(price_per_cup),
+        "cost_per_cup": money.units_to_decimal(cost_per_cup),
+        "fixed_costs": money.units_to_decimal(fixed_costs),
+    })
+
+
+async def list_plans(database, session, limit, before_id=None):
+    await ensure_schema(database)
+    query = select(PlanHistory).order_by(PlanHistory.id.desc()).limit(limit)
+    if before_id is not None:
+        query = query.where(PlanHistory.id < before_id)
+    return (await session.scalars(query)).all()
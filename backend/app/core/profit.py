@@ -0,0 +1,147 @@
+import numpy as np
+
+from . import money
+
+BATCH_COLUMNS = ("cups_planned", "price_per_cup", "cost_per_cup", "fixed_costs")
+RESULT_COLUMNS = ("revenue", "variable_costs", "total_costs", "profit", "break_even_cups")
+MONEY_COLUMNS = ("revenue", "variable_costs", "total_costs", "profit")
+
+
+def break_even_cups(price_per_cup, cost_per_cup, fixed_costs):
+    """Fewest whole cups that cover fixed costs, or None when each cup loses money or breaks even."""
+    margin = price_per_cup - cost_per_cup
+    if margin <= 0:
+        return None
+    return money.ceil_div(fixed_costs, margin)
+
+
+def calc_profit(cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    """Single plan; money in is integer units (see money.to_units), money out is whole cents."""
+    revenue = cups_planned * price_per_cup
+    variable_costs = cups_planned * cost_per_cup
+    total_costs = variable_costs + fixed_costs
+    return {
+        "revenue": money.units_to_cents(revenue),
+        "variable_costs": money.units_to_cents(variable_costs),
+        "total_costs": money.units_to_cents(total_costs),
+        "profit": money.units_to_cents(revenue - total_costs),
+        "break_even_cups": break_even_cups(price_per_cup, cost_per_cup, fixed_costs),
+    }
+
+
+def _cell(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
+
+
+def _column(values):
+    try:
+        column = np.asarray(values, dtype=np.float64)
+        if column.ndim == 1:
+            return column
+    except (TypeError, ValueError, OverflowError):
+        pass
+    # Cells that are not numbers become NaN, so validate_rows reports their rows as invalid.
+    return np.array([_cell(value) for value in values], dtype=np.float64)
+
+
+def as_columns(cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    columns = [_column(c) for c in (cups_planned, price_per_cup, cost_per_cup, fixed_costs)]
+    if len({c.shape for c in columns}) != 1:
+        raise ValueError("all columns must have the same length")
+    return columns
+
+
+def validate_rows(cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    """Return a boolean mask of rows that are finite, non-negative, in range and have whole cups."""
+    with np.errstate(invalid="ignore"):
+        valid = (
+            np.isfinite(cups_planned) & (cups_planned >= 0) & (cups_planned <= money.MAX_CUPS)
+            & (np.floor(cups_planned) == cups_planned)
+        )
+        for column in (price_per_cup, cost_per_cup, fixed_costs):
+            valid = valid & np.isfinite(column) & (column >= 0) & (column <= money.MAX_DOLLARS)
+    return valid
+
+
+def calc_profit_units_batch(cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    """Vectorized calc_profit over int64 arrays that broadcast together.
+
+    Break-even is -1 where there is no positive margin.
+    """
+    revenue = cups_planned * price_per_cup
+    variable_costs = cups_planned * cost_per_cup
+    total_costs = variable_costs + fixed_costs
+    margin = price_per_cup - cost_per_cup
+    has_break_even = margin > 0
+    break_even = np.where(has_break_even, money.ceil_div(fixed_costs, np.where(has_break_even, margin, 1)), -1)
+    return {
+        "revenue": money.units_to_cents_array(revenue),
+        "variable_costs": money.units_to_cents_array(variable_costs),
+        "total_costs": money.units_to_cents_array(total_costs),
+        "profit": money.units_to_cents_array(revenue - total_costs),
+        "break_even_cups": break_even,
+    }
+
+
+def calc_profit_batch(cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    """calc_profit_units_batch for float64 dollar columns, as used by the batch endpoint.
+
+    Money is converted to units before any arithmetic and comes back as int64
+    whole cents, never float dollars. Results of rows failing validation are
+    meaningless; ``valid`` says which rows those are.
+    """
+    valid = validate_rows(cups_planned, price_per_cup, cost_per_cup, fixed_costs)
+    result = calc_profit_units_batch(
+        np.where(valid, cups_planned, 0).astype(np.int64),
+        *(money.to_units_array(np.where(valid, column, 0.0)) for column in (price_per_cup, cost_per_cup, fixed_costs)),
+    )
+    result["valid"] = valid
+    return result
+
+
+def linear_demand(price_per_cup, intercept, slope):
+    """Cups sold at each price when every $1 of price loses ``slope`` cups."""
+    return np.maximum(intercept - slope * price_per_cup, 0.0)
+
+
+def elasticity_demand(price_per_cup, scale, elasticity):
+    """Constant-elasticity demand: ``scale`` cups at $1, scaled by price ** -elasticity."""
+    with np.errstate(divide="ignore"):
+        return scale * np.power(price_per_cup, -elasticity)
+
+
+def profit_grid(prices, cups, costs, fixed_costs, demand=None):
+    """Profit surface in whole cents over (cost, price, cups) axes.
+
+    Money axes and ``fixed_costs`` are int64 units and ``cups`` whole int64
+    counts, already in range, so no per-cell validation runs. ``demand`` maps
+    a float dollar price array to cups sold; when given, the profit-maximizing
+    price on the price axis is reported for each cost.
+    """
+    margin = prices[None, :] - costs[:, None]
+    plans = calc_profit_units_batch(np.int64(0), prices[None, :], costs[:, None], fixed_costs)
+    grid = {
+        # Only profit is returned per cell, and revenue - total costs == cups * margin - fixed.
+        "profit": money.units_to_cents_array(cups[None, None, :] * margin[:, :, None] - fixed_costs),
+        # Break-even does not depend on planned cups; -1 where there is none.
+        "break_even_cups": plans["break_even_cups"],
+    }
+    if demand is not None:
+        sold = np.floor(demand(prices / money.UNITS_PER_DOLLAR))
+        sellable = np.isfinite(sold) & (sold >= 0) & (sold <= money.MAX_CUPS)
+        sold = np.where(sellable, sold, 0).astype(np.int64)
+        along_demand = calc_profit_units_batch(sold[None, :], prices[None, :], costs[:, None], fixed_costs)["profit"]
+        best = np.argmax(np.where(sellable[None, :], along_demand, np.iinfo(np.int64).min), axis=1)
+        grid["optimal"] = [
+            {
+                "price_per_cup": float(prices[b]) / money.UNITS_PER_DOLLAR,
+                "cups_planned": int(sold[b]),
+                "profit": money.format_cents(int(along_demand[i, b])),
+            }
+            if sellable.any() else None
+            for i, b in enumerate(best)
+        ]
+    return grid
@@ -0,0 +1,159 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import money, profit
+
+# Cells are path-days. A chunk holds about six 8-byte arrays of this many
+# cells at once, so its working set stays around 20 MB.
+CHUNK_CELLS = 400_000
+# Runs larger than this are spread over the process pool instead of a thread.
+PARALLEL_CELLS = 8_000_000
+MAX_BINS = 10_001
+MAX_DEMAND = 1e9
+MAX_LOG_DEMAND = np.log(MAX_DEMAND)
+
+PARAMS = (
+    "cups_planned", "price_per_cup", "cost_per_cup", "fixed_costs", "days", "base_demand", "reference_price",
+    "elasticity", "sunny_probability", "sunny_multiplier", "rainy_multiplier", "traffic_sigma",
+)
+
+_pool = None
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        # spawn rather than fork: the server process has threads running.
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+class Aggregate:
+    """Mergeable season-profit statistics over a fixed histogram of cent-rounded profits.
+
+    The histogram spans every reachable profit (nothing sold .. everything sold),
+    so partial aggregates from different chunks can be summed exactly.
+    """
+
+    def __init__(self, low, high):
+        self.low = low
+        self.bins = int(min(MAX_BINS, round((high - low) * 100) + 1))
+        self.width = (high - low) / (self.bins - 1) if self.bins > 1 else 1.0
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.paths = 0
+        # Profits are whole cents, so the total is kept exactly as an integer.
+        self.total_cents = 0
+        self.total_sq = 0.0
+        self.losses = 0
+
+    def add(self, profits):
+        index = np.clip(np.rint((profits - self.low) / self.width), 0, self.bins - 1).astype(np.int64)
+        self.counts += np.bincount(index, minlength=self.bins)
+        self.paths += profits.size
+        self.total_cents += int(np.rint(profits * 100).sum())
+        self.total_sq += float(np.square(profits).sum())
+        self.losses += int((profits < 0).sum())
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.paths += other.paths
+        self.total_cents += other.total_cents
+        self.total_sq += other.total_sq
+        self.losses += other.losses
+
+    def percentile(self, q):
+        rank = np.searchsorted(np.cumsum(self.counts), q * self.paths)
+        return round(self.low + min(int(rank), self.bins - 1) * self.width, 2)
+
+    def summary(self):
+        if not self.paths:
+            return {"paths": 0}
+        mean = self.total_cents / 100 / self.paths
+        variance = max(self.total_sq / self.paths - mean * mean, 0.0)
+        return {
+            "paths": self.paths,
+            "mean": round(mean, 2),
+            "std": round(variance ** 0.5, 2),
+            "p5": self.percentile(0.05),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "probability_of_loss": self.losses / self.paths,
+        }
+
+
+def profit_bounds(params):
+    """Season profit in dollars when nothing is sold and when every cup made is sold."""
+    made = params["cups_planned"] * params["days"]
+    # Exact integer math: a whole season of cups can exceed the batch engine's caps.
+    best = profit.calc_profit(made, *(money.to_units(params[name]) for name in ("price_per_cup", "cost_per_cup",
+                                                                                "fixed_costs")))
+    return -best["total_costs"] / 100, best["profit"] / 100
+
+
+def simulate_chunk(params, seed, paths):
+    """Simulate ``paths`` seasons from one RNG stream and aggregate their profits.
+
+    Each day, demand at the reference price is scaled by weather (sunny or
+    rainy), log-normal foot traffic with mean 1 and the price elasticity; cups
+    sold are Poisson around that demand, capped by the cups made that day.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    shape = (paths, params["days"])
+    sunny = rng.random(shape) < params["sunny_probability"]
+    weather = np.where(sunny, params["sunny_multiplier"], params["rainy_multiplier"])
+    sigma = params["traffic_sigma"]
+    traffic = rng.lognormal(-sigma * sigma / 2, sigma, shape)
+    # In log space and capped, so a steep elasticity at a tiny price cannot overflow.
+    log_factor = -params["elasticity"] * np.log(params["price_per_cup"] / params["reference_price"])
+    price_factor = np.exp(np.minimum(log_factor, MAX_LOG_DEMAND))
+    demand = np.minimum(params["base_demand"] * price_factor * weather * traffic, MAX_DEMAND)
+    sold = np.minimum(rng.poisson(demand), params["cups_planned"]).sum(axis=1)
+
+    low, high = profit_bounds(params)
+    # Float dollars: a season's cups times units can overflow int64; Aggregate rounds to cents.
+    revenue = sold * (money.to_units(params["price_per_cup"]) / money.UNITS_PER_DOLLAR)
+    aggregate = Aggregate(low, high)
+    aggregate.add(revenue + low)
+    return aggregate
+
+
+def plan_chunks(params, paths, seed):
+    """Split a run into fixed-size chunks, each with its own child seed.
+
+    Chunk boundaries depend only on the inputs, so a seeded run gives the same
+    result however many workers execute it.
+    """
+    chunk_paths = max(1, CHUNK_CELLS // params["days"])
+    sizes = [chunk_paths] * (paths // chunk_paths)
+    if paths % chunk_paths:
+        sizes.append(paths % chunk_paths)
+    return list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+
+async def simulate(params, paths, seed):
+    """Run a season simulation, yielding the merged aggregate after every chunk."""
+    loop = asyncio.get_running_loop()
+    executor = get_pool() if paths * params["days"] > PARALLEL_CELLS else None
+    futures = [
+        loop.run_in_executor(executor, simulate_chunk, params, chunk_seed, size)
+        for chunk_seed, size in plan_chunks(params, paths, seed)
+    ]
+    total = Aggregate(*profit_bounds(params))
+    try:
+        for future in asyncio.as_completed(futures):
+            total.merge(await future)
+            yield total
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,126 @@
+import asyncio
+import importlib
+import logging
+from contextlib import contextmanager
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimings:
+    """Wall-clock seconds spent in each named startup phase."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        return {**{name: round(seconds, 6) for name, seconds in self.phases.items()}, "total": round(self.total, 6)}
+
+
+class Subsystem:
+    """A router module imported on the first request under one of ``paths``.
+
+    The module must define ``router`` and may define async ``startup(app)``
+    and ``shutdown(app)`` hooks, which run inside the app's lifespan.
+    """
+
+    def __init__(self, name, module, paths, prefix=""):
+        self.name = name
+        self.module = module
+        self.paths = tuple(paths)
+        self.prefix = prefix
+
+    def matches(self, path):
+        return any(path == p or path.startswith(p.rstrip("/") + "/") for p in self.paths)
+
+
+class SubsystemLoader:
+    def __init__(self, app, package, subsystems, timings):
+        self.app = app
+        self.package = package
+        self.subsystems = list(subsystems)
+        self.timings = timings
+        self.loaded = {}
+        self.running = False
+        self._lock = asyncio.Lock()
+
+    def _include(self, subsystem, module):
+        with self.timings.phase(f"load:{subsystem.name}"):
+            self.app.include_router(module.router, prefix=subsystem.prefix)
+            # Routes changed, so a cached schema would miss them.
+            self.app.openapi_schema = None
+        self.loaded[subsystem.name] = module
+        return module
+
+    def load_all(self):
+        for subsystem in self.subsystems:
+            if subsystem.name not in self.loaded:
+                with self.timings.phase(f"load:{subsystem.name}"):
+                    module = importlib.import_module(subsystem.module, self.package)
+                self._include(subsystem, module)
+
+    async def ensure(self, subsystem):
+        if subsystem.name in self.loaded:
+            return
+        async with self._lock:
+            if subsystem.name in self.loaded:
+                return
+            # Import off the event loop: numpy or SQLAlchemy can take a while the first time.
+            with self.timings.phase(f"load:{subsystem.name}"):
+                module = await asyncio.to_thread(importlib.import_module, subsystem.module, self.package)
+            self._include(subsystem, module)
+            if self.running and hasattr(module, "startup"):
+                await module.startup(self.app)
+            logger.info("loaded subsystem %s in %.1fms", subsystem.name, self.timings.phases[f"load:{subsystem.name}"] * 1e3)
+
+    async def ensure_for_path(self, path):
+        for subsystem in self.subsystems:
+            if subsystem.name not in self.loaded and subsystem.matches(path):
+                await self.ensure(subsystem)
+
+    async def startup(self):
+        self.running = True
+        with self.timings.phase("startup"):
+            for module in self.loaded.values():
+                if hasattr(module, "startup"):
+                    await module.startup(self.app)
+
+    async def shutdown(self):
+        self.running = False
+        # Reverse load order, mirroring startup.
+        for module in reversed(list(self.loaded.values())):
+            if hasattr(module, "shutdown"):
+                await module.shutdown(self.app)
+
+
+class LazySubsystemMiddleware:
+    """Loads the subsystem owning a request path before routing it."""
+
+    # Schema and docs requests need every route registered.
+    LOAD_ALL_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+    def __init__(self, app, loader):
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and len(self.loader.loaded) < len(self.loader.subsystems):
+            path = scope["path"]
+            if path in self.LOAD_ALL_PATHS:
+                for subsystem in self.loader.subsystems:
+                    await self.loader.ensure(subsystem)
+            else:
+                await self.loader.ensure_for_path(path)
+        await self.app(scope, receive, send)
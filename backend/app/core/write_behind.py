@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """Bounded in-memory buffer flushed to ``write_batch`` in bulk.
+
+    ``offer`` never blocks the request: once ``max_items`` records are waiting,
+    new ones are dropped and counted. A background task flushes whenever
+    ``flush_size`` records are queued or ``flush_interval`` seconds pass, and
+    ``stop`` drains whatever is left before returning. A failed batch is
+    dropped, unless ``is_record_error`` says the failure came from the data
+    rather than the store; then it is retried one record at a time so only
+    the bad records are lost.
+    """
+
+    def __init__(self, write_batch, max_items=10_000, flush_size=500, flush_interval=1.0, is_record_error=None):
+        self.write_batch = write_batch
+        self.is_record_error = is_record_error
+        self.max_items = max_items
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._items = deque()
+        # offer() is called from sync handlers on threadpool threads as well as the loop.
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+        self._task = None
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def offer(self, record):
+        with self._lock:
+            if len(self._items) >= self.max_items:
+                self.dropped += 1
+                return False
+            self._items.append(record)
+            full = len(self._items) == self.flush_size
+        if full and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._loop = None
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+        await self.flush()
+
+    def _take(self):
+        with self._lock:
+            count = min(len(self._items), self.flush_size)
+            return [self._items.popleft() for _ in range(count)]
+
+    async def flush(self):
+        batch = self._take()
+        while batch:
+            try:
+                await self.write_batch(batch)
+                self.written += len(batch)
+            except Exception as exc:
+                logger.exception("write-behind flush of %d records failed", len(batch))
+                retry = len(batch) > 1 and self.is_record_error is not None and self.is_record_error(exc)
+                self.failed += await self._write_each(batch) if retry else len(batch)
+            self.flushes += 1
+            batch = self._take()
+
+    async def _write_each(self, batch):
+        # Records failing on their own are dropped rather than requeued so the buffer stays bounded.
+        failed = 0
+        for record in batch:
+            try:
+                await self.write_batch([record])
+                self.written += 1
+            except Exception:
+                failed += 1
+        if failed:
+            logger.warning("write-behind dropped %d of %d records after retrying one by one", failed, len(batch))
+        return failed
+
+    def stats(self):
+        return {
+            "running": self._task is not None,
+            "queued": len(self._items),
+            "max_items": self.max_items,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
@@ -1,12 +1,87 @@
-from fastapi import FastAPI
-from .api.routes import router as api_router
+import logging
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="Sanjaya Service")
+from .core.subsystems import StartupTimings
 
+logger = logging.getLogger(__name__)
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+SLOW_REQUEST_SECONDS = 1.0
+SLOW_REQUEST_SAMPLE_RATE = 0.1
 
+# Loaded on the first request under their paths, so /health and /api/ping
+# never pay for numpy or SQLAlchemy.
+LAZY_SUBSYSTEMS = (
+    ("calc", ".api.calc", ["/api/calc-profit"], "/api"),
+    ("simulate", ".api.simulate", ["/api/simulate"], "/api"),
+    ("plans", ".api.plans", ["/api/plans"], "/api"),
+    ("ready", ".api.ready", ["/health/ready"], ""),
+)
 
-app.include_router(api_router, prefix="/api")
+
+def create_app(settings=None, lazy=True):
+    """Build the service app.
+
+    ``settings`` replaces the values read from the environment and .env for
+    this app only; its database and plan-history queue are built from them.
+    With ``lazy`` the subsystems in LAZY_SUBSYSTEMS are imported on their
+    first request instead of here. Per-phase startup timings end up on
+    ``app.state.startup_timings``.
+    """
+    timings = StartupTimings()
+    with timings.phase("imports"):
+        from fastapi import FastAPI
+
+        from .api import health, routes
+        from .core import config
+        from .core.metrics import MetricsMiddleware, MetricsRegistry
+        from .core.subsystems import LazySubsystemMiddleware, Subsystem, SubsystemLoader
+
+    with timings.phase("settings"):
+        settings = settings or config.get_settings()
+
+    with timings.phase("routers"):
+        @asynccontextmanager
+        async def lifespan(app):
+            await loader.startup()
+            logger.info("startup timings: %s", timings.as_dict())
+            yield
+            await loader.shutdown()
+            # Only set once some subsystem used the database.
+            database = getattr(app.state, "db", None)
+            if database is not None:
+                await database.dispose()
+
+        app = FastAPI(title="Sanjaya Service", lifespan=lifespan)
+        app.state.settings = settings
+        app.state.startup_timings = timings
+        app.state.metrics = MetricsRegistry()
+        app.include_router(health.router)
+        app.include_router(routes.router, prefix="/api")
+
+        loader = SubsystemLoader(app, __package__, (Subsystem(*spec) for spec in LAZY_SUBSYSTEMS), timings)
+        app.state.subsystems = loader
+        if lazy:
+            app.add_middleware(LazySubsystemMiddleware, loader=loader)
+        else:
+            loader.load_all()
+        app.add_middleware(
+            MetricsMiddleware,
+            registry=app.state.metrics,
+            slow_request_seconds=SLOW_REQUEST_SECONDS,
+            slow_request_sample_rate=SLOW_REQUEST_SAMPLE_RATE,
+        )
+    return app
+
+
+_app = None
+
+
+def __getattr__(name):
+    # ``app.main:app`` for uvicorn and ``from backend.app.main import app`` in
+    # tests build the default app on first access rather than at import.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,4 @@
+from .base import Base
+from .plan_history import PlanHistory
+
+__all__ = ["Base", "PlanHistory"]
@@ -0,0 +1,20 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PlanHistory(Base):
+    """One calculated plan; the autoincrement id doubles as the keyset pagination key."""
+
+    __tablename__ = "plan_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    cups_planned: Mapped[int] = mapped_column(Integer)
+    price_per_cup: Mapped[Decimal] = mapped_column(Numeric(14, 4, asdecimal=True))
+    cost_per_cup: Mapped[Decimal] = mapped_column(Numeric(14, 4, asdecimal=True))
+    fixed_costs: Mapped[Decimal] = mapped_column(Numeric(14, 4, asdecimal=True))
@@ -0,0 +1,293 @@
+"""Load and latency benchmarks for the service.
+
+Runs each scenario in-process through httpx's ASGI transport, or against a
+uvicorn server spawned on localhost, and reports throughput and p50/p95/p99
+latency. Results can be saved as a JSON baseline and later runs compared
+against it::
+
+    python -m backend.bench --save bench-baseline.json
+    python -m backend.bench --compare bench-baseline.json --threshold 0.25
+
+``--micro`` instead times the fixed-point money engine against the Decimal
+math it replaced.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import platform
+import socket
+import subprocess
+import sys
+import time
+import timeit
+from contextlib import asynccontextmanager
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+
+BATCH_ROWS = 1000
+BATCH_BODY = {
+    "cups_planned": [float(i % 200) for i in range(BATCH_ROWS)],
+    "price_per_cup": [1.0 + (i % 7) * 0.25 for i in range(BATCH_ROWS)],
+    "cost_per_cup": [0.3 + (i % 5) * 0.05 for i in range(BATCH_ROWS)],
+    "fixed_costs": [float(i % 30) for i in range(BATCH_ROWS)],
+}
+CACHED_PLAN = {"cups_planned": 100, "price_per_cup": "1.50", "cost_per_cup": "0.50", "fixed_costs": "20"}
+
+
+def _unique_plan(i):
+    # Distinct inputs on every call so the result cache never hits.
+    return {"cups_planned": i, "price_per_cup": "1.50", "cost_per_cup": "0.50", "fixed_costs": "20"}
+
+
+# name -> builds (method, path, request kwargs) for the i-th request
+SCENARIOS = {
+    "health": lambda i: ("GET", "/health", {}),
+    "ping": lambda i: ("GET", "/api/ping", {}),
+    "calc_profit": lambda i: ("POST", "/api/calc-profit", {"json": _unique_plan(i)}),
+    "calc_profit_cached": lambda i: ("POST", "/api/calc-profit", {"json": CACHED_PLAN}),
+    "calc_profit_batch": lambda i: ("POST", "/api/calc-profit/batch", {"json": BATCH_BODY}),
+}
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+async def run_scenario(client, build, requests, concurrency, warmup=10):
+    for i in range(warmup):
+        method, path, kwargs = build(requests + i)
+        await client.request(method, path, **kwargs)
+
+    counter = itertools.count()
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            if i >= requests:
+                return
+            method, path, kwargs = build(i)
+            start = time.perf_counter()
+            resp = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+    }
+
+
+@asynccontextmanager
+async def asgi_client():
+    from .app.main import create_app
+
+    app = create_app()
+    # ASGITransport sends no lifespan events; run them here so startup hooks
+    # (e.g. the plan-history writer) do the same work as under uvicorn.
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_client(startup_timeout=15.0):
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            deadline = time.monotonic() + startup_timeout
+            while True:
+                try:
+                    await client.get("/health")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or server.poll() is not None:
+                        raise RuntimeError("uvicorn did not come up")
+                    await asyncio.sleep(0.1)
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run_suite(scenarios=None, requests=200, concurrency=8, mode="asgi"):
+    names = scenarios or list(SCENARIOS)
+    connect = uvicorn_client if mode == "uvicorn" else asgi_client
+    async with connect() as client:
+        results = {}
+        for name in names:
+            results[name] = await run_scenario(client, SCENARIOS[name], requests, concurrency)
+    return {
+        "meta": {"mode": mode, "python": platform.python_version(), "machine": platform.machine()},
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Regressions of ``current`` against ``baseline``, one message per failing metric.
+
+    A scenario regresses when its p95 latency grows, or its throughput drops,
+    by more than ``threshold`` (0.25 == 25%). Scenarios missing from either
+    side are ignored.
+    """
+    regressions = []
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            continue
+        if after["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {after['p95_ms']}ms")
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {after['throughput_rps']} req/s")
+    return regressions
+
+
+CENT = Decimal("0.01")
+
+
+def decimal_profit(cups_planned, price_per_cup, cost_per_cup, fixed_costs):
+    """Reference: the per-request Decimal calculation the fixed-point engine replaced.
+
+    Rounds half up like the engine, so the timings compare like with like; the
+    money tests check the engine against this same function.
+    """
+    revenue = cups_planned * price_per_cup
+    variable_costs = cups_planned * cost_per_cup
+    total_costs = variable_costs + fixed_costs
+    margin = price_per_cup - cost_per_cup
+    return {
+        "revenue": revenue.quantize(CENT, ROUND_HALF_UP),
+        "variable_costs": variable_costs.quantize(CENT, ROUND_HALF_UP),
+        "total_costs": total_costs.quantize(CENT, ROUND_HALF_UP),
+        "profit": (revenue - total_costs).quantize(CENT, ROUND_HALF_UP),
+        "break_even_cups": math.ceil(fixed_costs / margin) if margin > 0 else None,
+    }
+
+
+def _per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number
+
+
+def run_micro(number=20_000, rows=100_000):
+    """Seconds per call for each engine on a single plan and on ``rows`` plans at once."""
+    from typing import Optional
+
+    from pydantic import BaseModel
+
+    from .app.api.calc import render_profit
+    from .app.core import money, profit
+
+    class DecimalProfitOutput(BaseModel):
+        revenue: Decimal
+        variable_costs: Decimal
+        total_costs: Decimal
+        profit: Decimal
+        break_even_cups: Optional[int]
+
+    plan = (100, Decimal("1.50"), Decimal("0.45"), Decimal("20.00"))
+
+    # Both sides go from validated Decimal inputs to response body bytes.
+    def single_decimal():
+        return DecimalProfitOutput(**decimal_profit(*plan)).model_dump_json().encode()
+
+    def single_fixed():
+        units = (plan[0], money.to_units(plan[1]), money.to_units(plan[2]), money.to_units(plan[3]))
+        return render_profit(profit.calc_profit(*units))
+
+    columns = [
+        [float(i % 200) for i in range(rows)],
+        [1.0 + (i % 7) * 0.25 for i in range(rows)],
+        [0.3 + (i % 5) * 0.05 for i in range(rows)],
+        [float(i % 30) for i in range(rows)],
+    ]
+    decimal_rows = [tuple(Decimal(repr(v)) for v in row) for row in zip(*columns)]
+    arrays = profit.as_columns(*columns)
+
+    def bulk_decimal():
+        return [decimal_profit(*row) for row in decimal_rows]
+
+    def bulk_fixed():
+        return profit.calc_profit_batch(*arrays)
+
+    results = {
+        "single_decimal": _per_call(single_decimal, number),
+        "single_fixed": _per_call(single_fixed, number),
+        "bulk_decimal": _per_call(bulk_decimal, 1),
+        "bulk_fixed": _per_call(bulk_fixed, 1),
+    }
+    results["single_speedup"] = results["single_decimal"] / results["single_fixed"]
+    results["bulk_speedup"] = results["bulk_decimal"] / results["bulk_fixed"]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--uvicorn", action="store_true", help="benchmark a spawned uvicorn server")
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--micro", action="store_true", help="time the money engine instead of HTTP routes")
+    args = parser.parse_args(argv)
+    if args.micro:
+        micro = run_micro()
+        print(f"single plan  decimal {micro['single_decimal'] * 1e6:8.2f}us  fixed {micro['single_fixed'] * 1e6:8.2f}us  "
+              f"x{micro['single_speedup']:.1f}")
+        print(f"100k plans   decimal {micro['bulk_decimal'] * 1e3:8.2f}ms  fixed {micro['bulk_fixed'] * 1e3:8.2f}ms  "
+              f"x{micro['bulk_speedup']:.1f}")
+        return 0
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run_suite(args.scenarios, args.requests, args.concurrency,
+                                   "uvicorn" if args.uvicorn else "asgi"))
+    for name, result in report["results"].items():
+        print(f"{name:20} {result['throughput_rps']:>9} req/s  p50 {result['p50_ms']:>8}ms  "
+              f"p95 {result['p95_ms']:>8}ms  p99 {result['p99_ms']:>8}ms  errors {result['errors']}")
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+import asyncio
+
+import pytest
+
+from backend.app.core import db
+from backend.app.core.config import settings
+from backend.app.core.plan_history import get_plan_writer
+from backend.app.main import app
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the default app at a fresh SQLite file with an empty plan-history queue."""
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'lemonade.db'}")
+    database = db.get_database(app)
+    asyncio.run(database.dispose())
+    get_plan_writer(app)._items.clear()
+    yield database
+    get_plan_writer(app)._items.clear()
+    asyncio.run(database.dispose())
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from backend.app.main import create_app
+from backend.app.core import config
+
+ROOT = Path(__file__).resolve().parents[1]
+COLD_START_BUDGET_SECONDS = float(os.environ.get("COLD_START_BUDGET_SECONDS", "2.0"))
+
+
+def _run(script):
+    out = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_skips_heavy_subsystems():
+    result = _run("""
+        import json, sys
+        from fastapi.testclient import TestClient
+        from backend.app.main import create_app
+
+        app = create_app()
+        client = TestClient(app)
+        statuses = [client.get("/health").status_code, client.get("/api/ping").status_code]
+        light = {name: name in sys.modules for name in ("sqlalchemy", "numpy")}
+        plan = {"cups_planned": 1, "price_per_cup": 1, "cost_per_cup": 0, "fixed_costs": 0}
+        statuses.append(client.get("/api/calc-profit", params=plan).status_code)
+        print(json.dumps({"statuses": statuses, "light": light, "numpy": "numpy" in sys.modules,
+                          "timings": app.state.startup_timings.as_dict()}))
+    """)
+    assert result["statuses"] == [200, 200, 200]
+    assert result["light"] == {"sqlalchemy": False, "numpy": False}
+    assert result["numpy"]
+    assert "load:calc" in result["timings"]
+
+
+def test_cold_start_budget():
+    result = _run("""
+        import json, time
+        start = time.perf_counter()
+        from backend.app.main import create_app
+        app = create_app()
+        print(json.dumps({"wall": time.perf_counter() - start, "timings": app.state.startup_timings.as_dict()}))
+    """)
+    timings = result["timings"]
+    assert set(timings) == {"imports", "settings", "routers", "total"}
+    assert timings["total"] < COLD_START_BUDGET_SECONDS
+    assert result["wall"] < COLD_START_BUDGET_SECONDS
+
+
+def test_startup_hooks_are_timed():
+    app = create_app()
+    with TestClient(app) as client:
+        client.get("/health")
+    assert "startup" in app.state.startup_timings.phases
+
+
+def test_explicit_settings_stay_with_their_app():
+    custom = config.Settings(DB_POOL_SIZE=3)
+    app = create_app(settings=custom)
+    assert app.state.settings is custom
+    assert config.get_settings() is not custom
+    assert create_app().state.settings is config.get_settings()
+
+
+def test_eager_app_registers_every_route():
+    app = create_app(lazy=False)
+    assert set(app.state.subsystems.loaded) == {"calc", "simulate", "plans", "ready"}
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    assert {"/health", "/api/ping", "/api/calc-profit", "/api/simulate", "/api/plans", "/health/ready"} <= set(paths)
+
+
+def test_openapi_lists_lazy_routes():
+    client = TestClient(create_app())
+    paths = client.get("/openapi.json").json()["paths"]
+    assert "/api/calc-profit/batch" in paths
+    assert "/api/plans" in paths
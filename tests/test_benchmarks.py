@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from backend import bench
+
+# Opt-in regression gate: BENCH_BASELINE=path/to/baseline.json [BENCH_THRESHOLD=0.25] pytest
+BASELINE = os.environ.get("BENCH_BASELINE")
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "0.25"))
+
+
+def _report(**results):
+    return {"results": {name: {"p95_ms": p95, "throughput_rps": rps} for name, (p95, rps) in results.items()}}
+
+
+def test_percentile_is_nearest_rank():
+    ordered = list(range(1, 101))
+    assert bench.percentile(ordered, 0.5) == 50
+    assert bench.percentile(ordered, 0.99) == 99
+    assert bench.percentile([7], 0.95) == 7
+    assert bench.percentile([], 0.5) == 0.0
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    baseline = _report(ping=(1.0, 1000.0), health=(1.0, 1000.0), gone=(1.0, 1.0))
+    current = _report(ping=(1.2, 900.0), health=(1.5, 600.0))
+    regressions = bench.compare(baseline, current, threshold=0.25)
+    assert regressions == ["health: p95 1.0ms -> 1.5ms", "health: throughput 1000.0 -> 600.0 req/s"]
+
+
+def test_asgi_client_runs_lifespan(sqlite_db):
+    async def scenario():
+        async with bench.asgi_client() as client:
+            await client.post("/api/calc-profit", json=bench.CACHED_PLAN)
+            return (await client.get("/api/plans/queue")).json()["running"]
+
+    assert asyncio.run(scenario())
+
+
+def test_suite_reports_every_scenario(sqlite_db):
+    report = asyncio.run(bench.run_suite(requests=20, concurrency=4))
+    assert report["meta"]["mode"] == "asgi"
+    assert set(report["results"]) == set(bench.SCENARIOS)
+    for result in report["results"].values():
+        assert result["errors"] == 0
+        assert result["throughput_rps"] > 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_cli_saves_baseline(tmp_path, sqlite_db):
+    out = tmp_path / "baseline.json"
+    assert bench.main(["ping", "--requests", "20", "--save", str(out)]) == 0
+    assert set(json.loads(out.read_text())["results"]) == {"ping"}
+
+
+@pytest.mark.skipif(not BASELINE, reason="set BENCH_BASELINE to enable the regression gate")
+def test_no_regression_against_baseline():
+    baseline = json.loads(Path(BASELINE).read_text())
+    sample = next(iter(baseline["results"].values()))
+    current = asyncio.run(bench.run_suite(
+        list(baseline["results"]), sample["requests"], sample["concurrency"], baseline["meta"]["mode"],
+    ))
+    assert bench.compare(baseline, current, THRESHOLD) == []
@@ -0,0 +1,213 @@
+import json
+
+import numpy as np
+import pytest
+
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core import money
+
+client = TestClient(app)
+
+PLAN = {"cups_planned": 100, "price_per_cup": 1.5, "cost_per_cup": 0.5, "fixed_costs": 20.0}
+
+GRID = {
+    "price_per_cup": {"start": 0.5, "stop": 2.0, "steps": 4},
+    "cups_planned": {"start": 0, "stop": 30, "steps": 4},
+    "cost_per_cup": 0.5,
+    "fixed_costs": 5.0,
+}
+
+
+def test_calc_profit():
+    resp = client.post("/api/calc-profit", json=PLAN)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert float(body["revenue"]) == 150.0
+    assert float(body["total_costs"]) == 70.0
+    assert float(body["profit"]) == 80.0
+    assert body["break_even_cups"] == 20
+
+
+def test_calc_profit_keeps_sub_cent_prices():
+    resp = client.post("/api/calc-profit", json={**PLAN, "cups_planned": 1000, "price_per_cup": "0.125"})
+    assert resp.json()["revenue"] == "125.00"
+
+
+def test_calc_profit_no_margin_has_no_break_even():
+    resp = client.post("/api/calc-profit", json={**PLAN, "cost_per_cup": 1.5})
+    assert resp.status_code == 200
+    assert resp.json()["break_even_cups"] is None
+
+
+def test_calc_profit_rejects_negative_input():
+    resp = client.post("/api/calc-profit", json={**PLAN, "cups_planned": -1})
+    assert resp.status_code == 422
+
+
+def test_calc_profit_batch_masks_bad_rows():
+    resp = client.post("/api/calc-profit/batch", json={
+        "cups_planned": [100, -5, 10, 3],
+        "price_per_cup": [1.5, 1.0, 0.7, None],
+        "cost_per_cup": [0.5, 0.5, 0.7, 0.1],
+        "fixed_costs": [20.0, 1.0, 2.0, 0.0],
+    })
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["valid"] == [True, False, True, False]
+    assert body["invalid_rows"] == 2
+    assert body["revenue"] == ["150.00", None, "7.00", None]
+    assert body["profit"] == ["80.00", None, "-2.00", None]
+    assert body["break_even_cups"] == [20, None, None, None]
+
+
+def test_calc_profit_batch_masks_malformed_cells():
+    resp = client.post("/api/calc-profit/batch", json={
+        "cups_planned": [100, "abc", 10, [1]],
+        "price_per_cup": [1.5, 1.0, {"x": 1}, 1.0],
+        "cost_per_cup": [0.5, 0.5, 0.5, 0.5],
+        "fixed_costs": [20.0, 1.0, 2.0, 0.0],
+    })
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["valid"] == [True, False, False, False]
+    assert body["invalid_rows"] == 3
+    assert body["profit"][0] == "80.00"
+
+
+def test_calc_profit_batch_matches_single():
+    rows = [
+        (100, 1.5, 0.5, 20.0), (7, 0.3, 0.2, 0.7), (0, 2.0, 1.0, 0.0), (12, 0.75, 0.25, 3.1), (1000, 0.125, 0.0, 0.0),
+        # Near the caps, where float dollars can no longer hold every cent.
+        (9_999_999, 9_999_999.99, 0.01, 9_999_999.99), (9_999_999, 0.0001, 9_999_999.99, 0.0),
+    ]
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(PLAN)}
+    batch = client.post("/api/calc-profit/batch", json=columns).json()
+    ndjson = client.post("/api/calc-profit/batch", json=columns, headers={"accept": "application/x-ndjson"})
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    for i, row in enumerate(rows):
+        single = client.post("/api/calc-profit", json=dict(zip(PLAN, row))).json()
+        for name in single:
+            assert batch[name][i] == lines[i][name] == single[name]
+    assert batch["revenue"][5] == "99999989900000.01"
+
+
+def test_calc_profit_batch_rejects_ragged_columns():
+    resp = client.post("/api/calc-profit/batch", json={
+        "cups_planned": [1, 2], "price_per_cup": [1.0], "cost_per_cup": [0.5], "fixed_costs": [0.0],
+    })
+    assert resp.status_code == 422
+
+
+def test_calc_profit_batch_streams_ndjson():
+    n = 20000
+    resp = client.post(
+        "/api/calc-profit/batch",
+        json={"cups_planned": [10] * n, "price_per_cup": [1.0] * n, "cost_per_cup": [0.25] * n, "fixed_costs": [3.0] * n},
+        headers={"accept": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = resp.text.splitlines()
+    assert len(lines) == n
+    last = json.loads(lines[-1])
+    assert last == {"row": n - 1, "valid": True, "revenue": "10.00", "variable_costs": "2.50",
+                    "total_costs": "5.50", "profit": "4.50", "break_even_cups": 4}
+
+
+def test_calc_profit_grid_surface_matches_single():
+    resp = client.post("/api/calc-profit/grid", json={
+        "price_per_cup": {"start": 0.5, "stop": 2.0, "steps": 4},
+        "cups_planned": {"start": 0, "stop": 30, "steps": 4},
+        "cost_per_cup": 0.5,
+        "fixed_costs": 5.0,
+    })
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["price_per_cup"] == [0.5, 1.0, 1.5, 2.0]
+    assert body["cups_planned"] == [0, 10, 20, 30]
+    assert body["shape"] == [1, 4, 4]
+    assert body["break_even_cups"] == [[None, 10, 5, 4]]
+    assert body["optimal"] is None
+    profits = iter(body["profit_cents"])
+    for price in body["price_per_cup"]:
+        for cups in body["cups_planned"]:
+            single = client.post("/api/calc-profit", json={**PLAN, "cups_planned": cups, "price_per_cup": price,
+                                                           "cost_per_cup": 0.5, "fixed_costs": 5.0}).json()
+            assert money.format_cents(next(profits)) == single["profit"]
+
+
+def test_calc_profit_grid_binary_surface():
+    grid = {**GRID, "cost_per_cup": {"start": 0.25, "stop": 0.5, "steps": 2}}
+    body = client.post("/api/calc-profit/grid", json=grid).json()
+    resp = client.post("/api/calc-profit/grid", json=grid, headers={"accept": "application/octet-stream"})
+    assert resp.headers["content-type"] == "application/octet-stream"
+    assert resp.headers["x-grid-shape"] == "2,4,4"
+    assert np.frombuffer(resp.content, dtype="<i8").tolist() == body["profit_cents"]
+
+
+def test_calc_profit_grid_optimal_price_linear_demand():
+    resp = client.post("/api/calc-profit/grid", json={
+        "price_per_cup": {"start": 0, "stop": 5, "steps": 501},
+        "cups_planned": {"start": 0, "stop": 100, "steps": 11},
+        "cost_per_cup": {"start": 0.3, "stop": 0.5, "steps": 2},
+        "fixed_costs": 10.0,
+        "demand": {"model": "linear", "intercept": 200, "slope": 40},
+    })
+    assert resp.status_code == 200
+    optimal = resp.json()["optimal"]
+    # Closed form for linear demand: (intercept + slope * cost) / (2 * slope).
+    assert optimal[0]["price_per_cup"] == 2.65
+    assert optimal[1]["price_per_cup"] == 2.75
+    assert float(optimal[0]["profit"]) > float(optimal[1]["profit"])
+
+
+def test_calc_profit_grid_optimal_price_elasticity_demand():
+    resp = client.post("/api/calc-profit/grid", json={
+        "price_per_cup": {"start": 0, "stop": 2, "steps": 201},
+        "cups_planned": {"start": 0, "stop": 10, "steps": 2},
+        "cost_per_cup": 0.4,
+        "fixed_costs": 0.0,
+        "demand": {"model": "elasticity", "scale": 1000, "elasticity": 2},
+    })
+    assert resp.status_code == 200
+    # Constant elasticity optimum is cost * e / (e - 1); whole cups make the peak a little flat.
+    assert resp.json()["optimal"][0]["price_per_cup"] == pytest.approx(0.8, abs=0.02)
+
+
+def test_calc_profit_grid_rejects_oversized_grid():
+    resp = client.post("/api/calc-profit/grid", json={
+        "price_per_cup": {"start": 0, "stop": 5, "steps": 5000},
+        "cups_planned": {"start": 0, "stop": 5000, "steps": 5000},
+        "cost_per_cup": 0.3,
+        "fixed_costs": 0.0,
+    })
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize("field, value", [
+    ("price_per_cup", {"start": 0, "stop": 20_000_000, "steps": 3}),
+    ("cost_per_cup", 20_000_000),
+    ("fixed_costs", 1e8),
+    ("cups_planned", {"start": 0, "stop": 2e9, "steps": 3}),
+])
+def test_calc_profit_grid_rejects_out_of_range_axes(field, value):
+    resp = client.post("/api/calc-profit/grid", json={**GRID, field: value})
+    assert resp.status_code == 422
+
+
+def test_calc_profit_grid_accepts_largest_axes():
+    resp = client.post("/api/calc-profit/grid", json={
+        "price_per_cup": {"start": 0, "stop": money.MAX_DOLLARS, "steps": 2},
+        "cups_planned": {"start": 0, "stop": money.MAX_CUPS, "steps": 2},
+        "cost_per_cup": 0,
+        "fixed_costs": money.MAX_DOLLARS,
+    })
+    assert resp.status_code == 200
+    assert resp.json()["profit_cents"][3] == (money.MAX_CUPS * money.MAX_DOLLARS - money.MAX_DOLLARS) * 100
+
+
+def test_calc_profit_grid_rejects_huge_steps_before_allocating():
+    resp = client.post("/api/calc-profit/grid", json={**GRID, "price_per_cup": {"start": 0, "stop": 5, "steps": 10**12}})
+    assert resp.status_code == 422
+    assert "cells" in resp.json()["detail"]
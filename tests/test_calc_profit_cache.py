@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.api import calc
+from backend.app.core.cache import ResultCache
+
+client = TestClient(app)
+
+QUERY = {"cups_planned": 40, "price_per_cup": "1.25", "cost_per_cup": "0.40", "fixed_costs": "12"}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    assert cache.get("a").body == b"1"
+    cache.put("c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries():
+    now = [0.0]
+    cache = ResultCache(ttl=10, clock=lambda: now[0])
+    cache.put("a", b"1")
+    now[0] = 9.9
+    assert cache.get("a") is not None
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_post_hits_cache_for_equal_decimals():
+    calc.result_cache.clear()
+    before = client.get("/api/calc-profit/cache").json()
+    first = client.post("/api/calc-profit", json={**QUERY, "price_per_cup": "1.25"})
+    second = client.post("/api/calc-profit", json={**QUERY, "price_per_cup": "1.250"})
+    after = client.get("/api/calc-profit/cache").json()
+    assert first.content == second.content
+    assert first.headers["etag"] == second.headers["etag"]
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_get_matches_post():
+    post = client.post("/api/calc-profit", json=QUERY)
+    get = client.get("/api/calc-profit", params=QUERY)
+    assert get.status_code == 200
+    assert get.json() == post.json()
+    assert get.headers["etag"] == post.headers["etag"]
+    assert "max-age" in get.headers["cache-control"]
+
+
+def test_get_honors_if_none_match():
+    etag = client.get("/api/calc-profit", params=QUERY).headers["etag"]
+    resp = client.get("/api/calc-profit", params=QUERY, headers={"If-None-Match": f'"other", {etag}'})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    stale = client.get("/api/calc-profit", params={**QUERY, "fixed_costs": "13"}, headers={"If-None-Match": etag})
+    assert stale.status_code == 200
+
+
+def test_get_rejects_invalid_query():
+    resp = client.get("/api/calc-profit", params={**QUERY, "cost_per_cup": "-1"})
+    assert resp.status_code == 422
@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from backend.app.main import app
+from backend.app.core import db
+from backend.app.core.config import Settings, settings
+
+
+def test_engine_is_created_lazily(sqlite_db):
+    assert sqlite_db._async_engine is None
+    engine = sqlite_db.get_async_engine()
+    assert engine is sqlite_db.get_async_engine()
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+
+
+def test_async_session_dependency(sqlite_db):
+    async def query():
+        sessions = db.get_async_db(SimpleNamespace(app=app))
+        session = await sessions.__anext__()
+        value = (await session.execute(text("SELECT 41 + 1"))).scalar_one()
+        await sessions.aclose()
+        await sqlite_db.dispose()
+        return value
+
+    assert asyncio.run(query()) == 42
+
+
+def test_sync_session_for_scripts(sqlite_db):
+    session = next(db.get_db())
+    assert session.execute(text("SELECT 1")).scalar_one() == 1
+    session.close()
+    asyncio.run(db.get_database().dispose())
+
+
+def test_ready_probe_reuses_pool(sqlite_db, monkeypatch):
+    monkeypatch.setattr(settings, "DB_READY_CACHE_SECONDS", 60.0)
+    checkouts = []
+    event.listen(sqlite_db.get_async_engine().sync_engine, "checkout", lambda *args: checkouts.append(1))
+    with TestClient(app) as client:
+        first = client.get("/health/ready")
+        second = client.get("/health/ready")
+    assert first.status_code == second.status_code == 200
+    assert first.json()["status"] == "ok"
+    assert "Pool size" in first.json()["pool"]
+    assert len(checkouts) == 1
+
+
+def test_ready_probe_reports_unreachable_database(sqlite_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    with TestClient(app) as client:
+        resp = client.get("/health/ready")
+        health = client.get("/health")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "unavailable"
+    assert health.status_code == 200
+
+
+def test_ready_probe_reports_missing_driver(sqlite_db, monkeypatch):
+    def missing_driver(*args, **kwargs):
+        raise ModuleNotFoundError("No module named 'aiomysql'")
+
+    monkeypatch.setattr(db, "create_async_engine", missing_driver)
+    with TestClient(app) as client:
+        resp = client.get("/health/ready")
+    assert resp.status_code == 503
+    assert resp.json()["error"] == "ModuleNotFoundError"
+    assert resp.json()["pool"] is None
+
+
+def test_sync_url_uses_default_driver_of_async_url():
+    assert Settings(DATABASE_URL="postgresql+asyncpg://u:p@db/app").database_url == "postgresql://u:p@db/app"
+    assert Settings(DATABASE_URL="sqlite+aiosqlite:///./x.db").database_url == "sqlite:///./x.db"
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core.metrics import MetricsMiddleware, MetricsRegistry
+
+client = TestClient(app)
+
+
+def _sample(text, name, **labels):
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    for line in text.splitlines():
+        if line.startswith(f"{name}{{{wanted}}} "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_counts_requests_per_route():
+    before = client.get("/metrics").text
+    client.get("/health")
+    client.get("/api/ping")
+    client.get("/api/ping")
+    client.get("/does-not-exist")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = resp.text
+
+    def delta(**labels):
+        return _sample(after, "http_requests_total", **labels) - _sample(before, "http_requests_total", **labels)
+
+    assert delta(method="GET", route="/health", status="2xx") == 1
+    assert delta(method="GET", route="/api/ping", status="2xx") == 2
+    assert delta(method="GET", route="unmatched", status="4xx") == 1
+    assert "/does-not-exist" not in after
+
+
+def test_metrics_histogram_is_cumulative():
+    client.get("/api/ping")
+    text = client.get("/metrics").text
+    labels = {"method": "GET", "route": "/api/ping"}
+    count = _sample(text, "http_request_duration_seconds_count", **labels)
+    assert count >= 1
+    assert _sample(text, "http_request_duration_seconds_bucket", **labels, le="+Inf") == count
+    assert _sample(text, "http_request_duration_seconds_bucket", **labels, le="0.005") <= count
+
+
+def test_metrics_records_validation_errors():
+    before = _sample(client.get("/metrics").text, "http_requests_total",
+                     method="POST", route="/api/calc-profit", status="4xx")
+    client.post("/api/calc-profit", json={"cups_planned": -1})
+    after = _sample(client.get("/metrics").text, "http_requests_total",
+                    method="POST", route="/api/calc-profit", status="4xx")
+    assert after - before == 1
+
+
+def test_route_label_uses_route_template():
+    registry = MetricsRegistry()
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    def item(item_id: str):
+        return {}
+
+    items = FastAPI()
+    items.include_router(router, prefix="/api")
+    items.add_middleware(MetricsMiddleware, registry=registry)
+    items_client = TestClient(items)
+    for item_id in ("a", "b", "api"):
+        items_client.get(f"/api/items/{item_id}")
+    assert list(registry.routes) == [("GET", "/api/items/{item_id}")]
+    assert registry.routes[("GET", "/api/items/{item_id}")].statuses[1] == 3
+
+
+def test_registry_buckets_by_upper_bound():
+    registry = MetricsRegistry()
+    registry.observe("GET", "/x", 200, 0.005)
+    registry.observe("GET", "/x", 503, 0.2)
+    stats = registry.routes[("GET", "/x")]
+    assert stats.buckets[0] == 1
+    assert stats.buckets[5] == 1
+    assert stats.statuses == [0, 1, 0, 0, 1]
+
+
+def test_slow_requests_are_logged(caplog):
+    async def slow_app(scope, receive, send):
+        time.sleep(0.01)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    registry = MetricsRegistry()
+    middleware = MetricsMiddleware(slow_app, registry, slow_request_seconds=0.0)
+    scope = {"type": "http", "method": "GET", "path": "/slow", "route": SimpleNamespace(path="/slow"), "path_params": {}}
+    with caplog.at_level(logging.WARNING, logger="backend.app.core.metrics"):
+        asyncio.run(middleware(scope, receive, send))
+    assert "slow request GET /slow" in caplog.text
+    assert registry.routes[("GET", "/slow")].statuses[1] == 1
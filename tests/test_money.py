@@ -0,0 +1,102 @@
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from backend import bench
+from backend.app.api.calc import render_profit
+from backend.app.api.schemas import ProfitCalculationOutput
+from backend.app.core import money, profit
+
+UNIT = Decimal("0.0001")
+
+# Amounts with up to four decimal places, as a client would type them.
+amounts = st.decimals(min_value=0, max_value=money.MAX_DOLLARS, places=4, allow_nan=False, allow_infinity=False)
+units = st.integers(min_value=0, max_value=money.MAX_DOLLARS * money.UNITS_PER_DOLLAR)
+cups = st.integers(min_value=0, max_value=money.MAX_CUPS)
+
+
+def reference_units(value):
+    return int(Decimal(value).quantize(UNIT, ROUND_HALF_UP) * money.UNITS_PER_DOLLAR)
+
+
+@given(st.decimals(min_value=0, max_value=money.MAX_DOLLARS, places=6, allow_nan=False, allow_infinity=False))
+def test_to_units_matches_decimal_half_up(value):
+    assert money.to_units(value) == reference_units(value)
+    assert money.to_units(str(value)) == reference_units(value)
+    assert money.to_units(float(value)) == reference_units(repr(float(value)))
+
+
+@given(st.lists(amounts, min_size=1, max_size=50))
+def test_to_units_array_matches_scalar(values):
+    floats = [float(v) for v in values]
+    assert money.to_units_array(np.array(floats)).tolist() == [money.to_units(f) for f in floats]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0.125", 1250), ("1.00005", 10001), ("1.00004999", 10000), (1.00005, 10001), ("1e2", 1_000_000), (3, 30_000),
+])
+def test_to_units_rounds_half_up(value, expected):
+    assert money.to_units(value) == expected
+
+
+@pytest.mark.parametrize("value", [-0.01, "-1", float("nan"), float("inf"), "abc", True, None])
+def test_to_units_rejects_bad_amounts(value):
+    with pytest.raises(ValueError):
+        money.to_units(value)
+
+
+@pytest.mark.parametrize("units, cents", [(0, 0), (49, 0), (50, 1), (1250, 13), (-50, -1), (-1249, -12)])
+def test_units_to_cents_rounds_half_away_from_zero(units, cents):
+    assert money.units_to_cents(units) == cents
+    assert money.units_to_cents_array(np.array([units])).tolist() == [cents]
+
+
+def test_sub_cent_prices_keep_their_precision():
+    result = profit.calc_profit(1000, money.to_units("0.125"), 0, 0)
+    assert money.format_cents(result["revenue"]) == "125.00"
+
+
+@given(cups, amounts, amounts, amounts)
+def test_calc_profit_matches_decimal(cups_planned, price, cost, fixed):
+    expected = bench.decimal_profit(cups_planned, price, cost, fixed)
+    result = profit.calc_profit(cups_planned, money.to_units(price), money.to_units(cost), money.to_units(fixed))
+    assert result["break_even_cups"] == expected.pop("break_even_cups")
+    assert {name: Decimal(result[name]).scaleb(-2) for name in expected} == expected
+
+
+@given(units, units, units)
+def test_break_even_is_none_only_without_margin(price, cost, fixed):
+    break_even = profit.break_even_cups(price, cost, fixed)
+    if price <= cost:
+        assert break_even is None
+    else:
+        assert break_even == math.ceil(Decimal(fixed) / Decimal(price - cost))
+
+
+@given(st.lists(st.tuples(cups, units, units, units), min_size=1, max_size=50))
+def test_units_batch_matches_single(rows):
+    batch = profit.calc_profit_units_batch(*(np.array(column, dtype=np.int64) for column in zip(*rows)))
+    for i, row in enumerate(rows):
+        single = profit.calc_profit(*row)
+        assert {name: int(batch[name][i]) for name in profit.MONEY_COLUMNS} == {
+            name: single[name] for name in profit.MONEY_COLUMNS
+        }
+        # The batch marks "no break-even" with -1.
+        expected = -1 if single["break_even_cups"] is None else single["break_even_cups"]
+        assert int(batch["break_even_cups"][i]) == expected
+
+
+@settings(max_examples=50)
+@given(cups, units, units, units)
+def test_render_profit_matches_pydantic(cups_planned, price, cost, fixed):
+    result = profit.calc_profit(cups_planned, price, cost, fixed)
+    assert render_profit(result) == ProfitCalculationOutput(**result).model_dump_json().encode()
+
+
+def test_microbenchmark_shows_bulk_speedup():
+    results = bench.run_micro(number=200, rows=20_000)
+    assert results["bulk_speedup"] > 1
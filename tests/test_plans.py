@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from backend.app.main import app, create_app
+from backend.app.core import plan_history
+from backend.app.core.config import Settings, settings
+from backend.app.core.write_behind import WriteBehindQueue
+
+PLAN = {"cups_planned": 100, "price_per_cup": "1.50", "cost_per_cup": "0.50", "fixed_costs": "20"}
+
+
+def _run_queue(queue, records, wait=0.0):
+    async def scenario():
+        queue.start()
+        for record in records:
+            queue.offer(record)
+        await asyncio.sleep(wait)
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_queue_flushes_in_batches_of_flush_size():
+    batches = []
+
+    async def write(batch):
+        batches.append(batch)
+
+    queue = WriteBehindQueue(write, flush_size=3, flush_interval=60)
+    _run_queue(queue, range(7), wait=0.01)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert queue.stats()["written"] == 7
+
+
+def test_queue_flushes_on_interval():
+    batches = []
+
+    async def write(batch):
+        batches.append(batch)
+
+    queue = WriteBehindQueue(write, flush_size=100, flush_interval=0.01)
+    _run_queue(queue, ["a"], wait=0.1)
+    assert batches == [["a"]]
+
+
+def test_queue_drops_when_full_and_counts_failures():
+    async def write(batch):
+        raise RuntimeError("database down")
+
+    queue = WriteBehindQueue(write, max_items=2, flush_size=10, flush_interval=60)
+    assert queue.offer(1) and queue.offer(2)
+    assert not queue.offer(3)
+    _run_queue(queue, [])
+    stats = queue.stats()
+    assert stats["dropped"] == 1
+    assert stats["failed"] == 2
+    assert stats["queued"] == 0
+
+
+def test_queue_retries_failed_batch_one_by_one():
+    written = []
+
+    async def write(batch):
+        if "bad" in batch:
+            raise OverflowError("too large")
+        written.extend(batch)
+
+    queue = WriteBehindQueue(write, flush_size=10, flush_interval=60,
+                             is_record_error=lambda exc: isinstance(exc, OverflowError))
+    _run_queue(queue, [1, 2, "bad", 3])
+    assert written == [1, 2, 3]
+    assert queue.stats()["written"] == 3
+    assert queue.stats()["failed"] == 1
+
+
+def test_queue_drops_whole_batch_when_store_is_down():
+    calls = []
+
+    async def write(batch):
+        calls.append(batch)
+        raise RuntimeError("database down")
+
+    queue = WriteBehindQueue(write, flush_size=10, flush_interval=60, is_record_error=plan_history.is_record_error)
+    _run_queue(queue, [1, 2, 3])
+    assert calls == [[1, 2, 3]]
+    assert queue.stats()["failed"] == 3
+
+
+def test_plan_history_classifies_insert_errors(sqlite_db, tmp_path, monkeypatch):
+    row = {"created_at": datetime.now(timezone.utc), "cups_planned": 10**20,
+           "price_per_cup": Decimal(1), "cost_per_cup": Decimal(1), "fixed_costs": Decimal(1)}
+
+    def insert_error():
+        try:
+            asyncio.run(plan_history.insert_plans(sqlite_db, [row]))
+        except Exception as exc:
+            return exc
+
+    assert plan_history.is_record_error(insert_error())
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    asyncio.run(sqlite_db.dispose())
+    assert not plan_history.is_record_error(insert_error())
+
+
+def test_plans_reject_values_the_columns_cannot_hold(sqlite_db):
+    with TestClient(app) as client:
+        for cups in (1, 2, 10**20, 3):
+            client.post("/api/calc-profit", json={**PLAN, "cups_planned": cups})
+        assert client.post("/api/calc-profit", json={**PLAN, "cups_planned": 10**20}).status_code == 422
+        assert client.post("/api/calc-profit", json={**PLAN, "fixed_costs": "1e12"}).status_code == 422
+    with TestClient(app) as client:
+        assert [item["cups_planned"] for item in client.get("/api/plans").json()["items"]] == [3, 2, 1]
+
+
+def test_plans_are_persisted_and_paginated(sqlite_db):
+    with TestClient(app) as client:
+        for cups in (10, 20, 30):
+            assert client.post("/api/calc-profit", json={**PLAN, "cups_planned": cups}).status_code == 200
+        assert client.post("/api/calc-profit", json={**PLAN, "cups_planned": 40}).status_code == 200
+        # GET is cacheable and idempotent, so it is not recorded.
+        assert client.get("/api/calc-profit", params={**PLAN, "cups_planned": 50}).status_code == 200
+
+    # Leaving the client ran the shutdown drain, so everything is on disk now.
+    with TestClient(app) as client:
+        first = client.get("/api/plans", params={"limit": 3}).json()
+        assert [item["cups_planned"] for item in first["items"]] == [40, 30, 20]
+        assert first["items"][0]["price_per_cup"] == "1.5000"
+        second = client.get("/api/plans", params={"limit": 3, "before_id": first["next_before_id"]}).json()
+        assert [item["cups_planned"] for item in second["items"]] == [10]
+        assert second["next_before_id"] is None
+        assert client.get("/api/plans/queue").json()["queued"] == 0
+
+
+def test_plans_empty_history(sqlite_db):
+    with TestClient(app) as client:
+        resp = client.get("/api/plans")
+    assert resp.status_code == 200
+    assert resp.json() == {"items": [], "next_before_id": None}
+
+
+def test_apps_keep_their_own_database_and_queue(tmp_path):
+    apps = {
+        name: create_app(settings=Settings(DATABASE_URL=f"sqlite+aiosqlite:///{tmp_path / name}.db",
+                                           PLAN_HISTORY_FLUSH_SIZE=size))
+        for name, size in (("a", 7), ("b", 9))
+    }
+    for cups, name in ((1, "a"), (2, "b"), (3, "a")):
+        with TestClient(apps[name]) as client:
+            client.post("/api/calc-profit", json={**PLAN, "cups_planned": cups})
+    for name, expected in (("a", [3, 1]), ("b", [2])):
+        with TestClient(apps[name]) as client:
+            assert [item["cups_planned"] for item in client.get("/api/plans").json()["items"]] == expected
+    assert plan_history.get_plan_writer(apps["a"]).flush_size == 7
+    assert plan_history.get_plan_writer(apps["b"]).flush_size == 9
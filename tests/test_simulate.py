@@ -0,0 +1,83 @@
+import json
+
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core import money, simulation
+
+client = TestClient(app)
+
+SEASON = {
+    "cups_planned": 50, "price_per_cup": 1.0, "cost_per_cup": 0.3, "fixed_costs": 200.0,
+    "days": 30, "base_demand": 40, "paths": 5000, "seed": 7,
+}
+
+
+def test_simulate_summary():
+    resp = client.post("/api/simulate", json=SEASON)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["seed"] == 7
+    assert body["paths"] == body["total_paths"] == 5000
+    assert body["p5"] <= body["p50"] <= body["p95"]
+    # Selling every cup made is the best case: 1500 cups * $0.70 margin - $200.
+    assert body["p95"] <= 850.0
+    assert 0.0 <= body["probability_of_loss"] <= 1.0
+
+
+def test_simulate_is_reproducible_and_chunking_independent(monkeypatch):
+    first = client.post("/api/simulate", json=SEASON).json()
+    assert client.post("/api/simulate", json=SEASON).json() == first
+    monkeypatch.setattr(simulation, "CHUNK_CELLS", 30 * 700)
+    chunked = client.post("/api/simulate", json=SEASON).json()
+    # Different chunking draws different streams, but the distribution agrees.
+    assert abs(chunked["mean"] - first["mean"]) < 10
+
+
+def test_simulate_process_pool_matches_in_process(monkeypatch):
+    expected = client.post("/api/simulate", json=SEASON).json()
+    monkeypatch.setattr(simulation, "PARALLEL_CELLS", 0)
+    try:
+        assert client.post("/api/simulate", json=SEASON).json() == expected
+    finally:
+        simulation.shutdown_pool()
+
+
+def test_simulate_expensive_plan_always_loses():
+    resp = client.post("/api/simulate", json={**SEASON, "cost_per_cup": 2.0})
+    assert resp.json()["probability_of_loss"] == 1.0
+
+
+def test_simulate_streams_progress_events(monkeypatch):
+    monkeypatch.setattr(simulation, "CHUNK_CELLS", 30 * 1000)
+    resp = client.post("/api/simulate", json=SEASON, headers={"accept": "text/event-stream"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in resp.text.strip().split("\n\n")]
+    names = [lines[0] for lines in events]
+    assert names == ["event: progress"] * 5 + ["event: result"]
+    paths = [json.loads(lines[1][len("data: "):])["paths"] for lines in events]
+    assert paths == [1000, 2000, 3000, 4000, 5000, 5000]
+
+
+def test_simulate_rejects_oversized_plan():
+    resp = client.post("/api/simulate", json={**SEASON, "cups_planned": 10**20})
+    assert resp.status_code == 422
+
+
+def test_simulate_rejects_out_of_range_money():
+    resp = client.post("/api/simulate", json={**SEASON, "price_per_cup": 1e8})
+    assert resp.status_code == 422
+
+
+def test_simulate_largest_plan_has_finite_bounds():
+    season = {**SEASON, "cups_planned": money.MAX_CUPS, "price_per_cup": money.MAX_DOLLARS, "days": 366, "paths": 10}
+    resp = client.post("/api/simulate", json=season)
+    assert resp.status_code == 200
+    assert resp.json()["paths"] == 10
+
+
+def test_simulate_steep_elasticity_at_tiny_price():
+    season = {**SEASON, "price_per_cup": 1e-300, "elasticity": 20}
+    assert client.post("/api/simulate", json=season).status_code == 200
+    assert client.post("/api/simulate", json={**season, "base_demand": 0}).json()["probability_of_loss"] == 1.0
+    assert client.post("/api/simulate", json={**season, "elasticity": 200}).status_code == 422